@@ -6,24 +6,30 @@ import threading
 import json
 import csv
 import sys
+import signal
+import argparse
+import math
 
-# Try imports for Overlay (Tkinter/Windows API)
-try:
-    import tkinter as tk
-    from tkinter import ttk
-    import ctypes
-    TKINTER_AVAILABLE = True
-except ImportError:
-    TKINTER_AVAILABLE = False
+# Overlay-only modules (Tkinter/Windows API) are imported on demand by load_gui()
+# so the web, relay and replay modes start without pulling in a GUI toolkit.
+tk = None
+ctypes = None
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
 
 # --- CONFIGURATION ---
+# Defaults below can be overridden with a JSON file (--config) or command-line flags.
 UDP_IP = "0.0.0.0" 
 UDP_PORT = 5300
 WEB_PORT = 8000
 # OVERLAY_X is now calculated dynamically in the class to be on the right
 OVERLAY_Y = 50 
+OVERLAY_FRAME_MS = 33   # Overlay redraw budget (ms between frames)
+OVERLAY_RPM_STEP = 50   # RPM readout is rounded to this step so it doesn't repaint every frame
+STRATEGY_TIRE_LIMIT = 40.0  # Tire health (%) that "tire laps left" counts down to
+STRATEGY_ALPHA = 0.3        # EWMA weight of the most recent lap in the wear/fuel rates
+STRATEGY_JOIN_S = 2.0       # A lap already this far along (cur_lap, s) when first seen is not used as a sample
 
 # --- SHARED TELEMETRY PARSER ---
 class TelemetryData:
@@ -68,6 +74,141 @@ class TelemetryData:
     def to_dict(self):
         return vars(self).copy()
 
+# --- STREAM HEALTH ---
+HEALTH_HIST_MS = 50   # Histograms use 1 ms bins up to this value; the last bin collects everything above
+HEALTH_RESET_MS = 1000   # timestamp_ms jumping further than this either way is a stream break (pause, loading, restart, replay), not loss
+
+class StreamHealth:
+    """Streaming loss/jitter analysis of one UDP source, using the game's timestamp_ms.
+    Memory is constant: running counters, an EWMA jitter estimate, two fixed-size histograms and
+    the most recent gap, so a late packet that fills that gap is no longer counted as missing."""
+    def __init__(self, nominal_ms=1000 / 60):
+        self.interval_ms = nominal_ms
+        self.packets = 0
+        self.missing = 0
+        self.gaps = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.filled = 0
+        self.resets = 0
+        self.jitter_ms = 0.0
+        self.last_ts = None
+        self.last_arrival = None
+        self.gap = None   # (start_ts, end_ts, still_missing) of the most recent gap
+        self.arrival_hist = [0] * (HEALTH_HIST_MS + 1)
+        self.timestamp_hist = [0] * (HEALTH_HIST_MS + 1)
+
+    def _bin(self, ms):
+        return min(max(int(ms), 0), HEALTH_HIST_MS)
+
+    def _diff(self, a, b):
+        # Signed difference a - b so the uint32 millisecond counter can wrap
+        return ((a - b + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+    def observe(self, timestamp_ms, arrival):
+        """Record a packet (arrival in seconds). Returns (status, missing_before) where status is
+        'ok', 'gap', 'duplicate', 'late', 'filled' (a late packet inside the last gap) or 'reset'
+        (timestamp_ms jumped more than HEALTH_RESET_MS either way)."""
+        self.packets += 1
+        if self.last_ts is None:
+            self.last_ts, self.last_arrival = timestamp_ms, arrival
+            return "ok", 0
+        d_ts = self._diff(timestamp_ms, self.last_ts)
+        if d_ts == 0:
+            self.duplicates += 1
+            return "duplicate", 0
+        if abs(d_ts) > HEALTH_RESET_MS:
+            self.resets += 1
+            self.last_ts, self.last_arrival, self.gap = timestamp_ms, arrival, None
+            return "reset", 0
+        if d_ts < 0:
+            self.reordered += 1
+            if self.gap and self.gap[2] > 0 and 0 < self._diff(timestamp_ms, self.gap[0]) < self._diff(self.gap[1], self.gap[0]):
+                self.gap = (self.gap[0], self.gap[1], self.gap[2] - 1)
+                self.missing -= 1
+                self.filled += 1
+                return "filled", 0
+            return "late", 0
+        # Arrival spacing is measured between in-order packets, the same reference as d_ts
+        arrival_ms = (arrival - self.last_arrival) * 1000
+        self.arrival_hist[self._bin(arrival_ms)] += 1
+        prev_ts = self.last_ts
+        self.last_ts, self.last_arrival = timestamp_ms, arrival
+        self.timestamp_hist[self._bin(d_ts)] += 1
+        # RFC 3550 style interarrival jitter: smoothed |arrival spacing - send spacing|
+        self.jitter_ms += (abs(arrival_ms - d_ts) - self.jitter_ms) / 16
+        if d_ts > 1.5 * self.interval_ms:
+            missing = max(1, round(d_ts / self.interval_ms) - 1)
+            self.gaps += 1
+            self.missing += missing
+            self.gap = (prev_ts, timestamp_ms, missing)
+            return "gap", missing
+        self.interval_ms += (d_ts - self.interval_ms) / 16
+        return "ok", 0
+
+    def summary(self):
+        expected = self.packets - self.duplicates - (self.reordered - self.filled) + self.missing
+        return {
+            "packets": self.packets, "missing": self.missing, "gaps": self.gaps,
+            "duplicates": self.duplicates, "reordered": self.reordered, "filled": self.filled,
+            "resets": self.resets,
+            "loss_pct": round(100 * self.missing / expected, 2) if expected else 0.0,
+            "jitter_ms": round(self.jitter_ms, 2), "interval_ms": round(self.interval_ms, 2),
+            "arrival_hist_ms": self.arrival_hist, "timestamp_hist_ms": self.timestamp_hist,
+        }
+
+# --- STRATEGY PREDICTOR ---
+class StrategyPredictor:
+    """Tire wear and fuel burn per lap, as EWMAs over lap summaries.
+    Each packet only updates the current readings; the rates change once per completed lap."""
+    def __init__(self, alpha=None, tire_limit=None):
+        self.alpha = alpha if alpha is not None else STRATEGY_ALPHA
+        self.tire_limit = tire_limit if tire_limit is not None else STRATEGY_TIRE_LIMIT
+        self.lap = None
+        self.lap_start = None
+        self.health = [100.0] * 4
+        self.fuel = 1.0
+        self.wear_rate = None   # Tire health (%) lost per lap, per tire
+        self.fuel_rate = None   # Fuel fraction used per lap
+
+    def update(self, packet):
+        self.health = [max(0.0, min(100.0, (1.0 - w) * 100)) for w in packet.tire_wear]
+        self.fuel = packet.fuel
+        if packet.lap_number == self.lap: return
+        if self.lap is not None and packet.lap_number == self.lap + 1:
+            self._close_lap()
+        elif self.lap is not None and packet.lap_number < self.lap:
+            # New race or session restart: old rates no longer apply
+            self.wear_rate = self.fuel_rate = None
+        joined_mid_lap = self.lap is None and packet.cur_lap > STRATEGY_JOIN_S
+        self.lap = packet.lap_number
+        # A lap joined in progress would understate the per-lap rates, so it gets no start reading
+        self.lap_start = None if joined_mid_lap else (self.health, self.fuel)
+
+    def _close_lap(self):
+        if self.lap_start is None: return
+        start_health, start_fuel = self.lap_start
+        wear = [s - h for s, h in zip(start_health, self.health)]
+        # Negative deltas mean a pit stop (fresh tires / refuel); skip that sample
+        if min(wear) >= 0:
+            if self.wear_rate is None: self.wear_rate = wear
+            else: self.wear_rate = [r + self.alpha * (w - r) for r, w in zip(self.wear_rate, wear)]
+        burned = start_fuel - self.fuel
+        if burned >= 0:
+            if self.fuel_rate is None: self.fuel_rate = burned
+            else: self.fuel_rate += self.alpha * (burned - self.fuel_rate)
+
+    def predict(self):
+        """Laps left per tire until tire_limit, and laps of fuel left. -1 means no estimate yet."""
+        tires = [-1.0] * 4
+        if self.wear_rate is not None:
+            for i, (h, r) in enumerate(zip(self.health, self.wear_rate)):
+                if h <= self.tire_limit: tires[i] = 0.0
+                elif r > 0: tires[i] = round(min(999.0, (h - self.tire_limit) / r), 1)
+        fuel = -1.0
+        if self.fuel_rate: fuel = round(min(999.0, self.fuel / self.fuel_rate), 1)
+        return {"tire_laps_left": tires, "fuel_laps_left": fuel}
+
 # ==========================================
 # MODE 1: WEB SERVER, LOGGER & COMMENTARY
 # ==========================================
@@ -76,9 +217,87 @@ current_telemetry = {
     "rpm": 0, "speed": 0, "gear": "N", "position": 0, 
     "lap": 0, "best_lap": 0.0, "track_id": 0, "race_on": False,
     "tire_wear": [100.0, 100.0, 100.0, 100.0],
-    "tire_temp": [0, 0, 0, 0]
+    "tire_temp": [0, 0, 0, 0],
+    "tire_laps_left": [-1.0, -1.0, -1.0, -1.0], "fuel_laps_left": -1.0
 }
 
+# --- COMPACT DELTA FEED ---
+# /schema describes the fields; /delta?since=SEQ returns a little-endian binary frame:
+#   uint32 epoch, uint32 seq, then for each field changed after SEQ: uint8 field index + value
+#   packed per its format.
+# Integer fields are sent as round(value * scale). A client that is new or out of sync (since=0
+# or since > seq) receives every field. The epoch is random per server start (also in /schema);
+# when it changes, clients must drop their state and resync from since=0.
+# /stream?since=SEQ keeps one response open and pushes the same frames, each prefixed with a
+# uint16 length, whenever the feed changes (checked every DELTA_STREAM_MS).
+WIRE_SCHEMA = [
+    ("rpm", "H", 1), ("max_rpm", "H", 1), ("speed", "H", 10), ("gear", "2s", 1),
+    ("position", "B", 1), ("lap", "H", 1), ("best_lap", "f", 1), ("track_id", "i", 1),
+    ("race_on", "?", 1), ("tire_wear", "4B", 1), ("tire_temp", "4h", 1),
+    ("tire_laps_left", "4h", 10), ("fuel_laps_left", "h", 10),
+]
+
+# Representable range of each integer format; out-of-range values are clamped, NaN/inf become the sentinel
+WIRE_INT_RANGES = {"B": (0, 0xFF), "H": (0, 0xFFFF), "h": (-0x8000, 0x7FFF), "i": (-0x80000000, 0x7FFFFFFF)}
+WIRE_FLOAT_MAX = 3.4e38
+DELTA_STREAM_MS = 100
+WIRE_SENTINEL = -1   # Same "no value" marker as the strategy predictions; 0 for unsigned formats
+
+class DeltaFeed:
+    def __init__(self, schema):
+        self.schema = schema
+        self.structs = [struct.Struct("<" + fmt) for _, fmt, _ in schema]
+        self.epoch = int.from_bytes(os.urandom(4), "little")
+        self.seq = 0
+        self.packed = [None] * len(schema)
+        self.changed_at = [0] * len(schema)
+
+    def wire_value(self, code, scale, v):
+        if code == "?": return bool(v)
+        if not math.isfinite(v):
+            return 0 if WIRE_INT_RANGES.get(code, (-1,))[0] == 0 else WIRE_SENTINEL
+        if code == "f": return max(-WIRE_FLOAT_MAX, min(WIRE_FLOAT_MAX, v))
+        lo, hi = WIRE_INT_RANGES[code]
+        return max(lo, min(hi, round(v * scale)))
+
+    def pack_field(self, i, value):
+        _, fmt, scale = self.schema[i]
+        if fmt.endswith("s"): return self.structs[i].pack(str(value).encode())
+        code = fmt[-1]
+        values = value if isinstance(value, (list, tuple)) else (value,)
+        return self.structs[i].pack(*[self.wire_value(code, scale, v) for v in values])
+
+    def update(self, telemetry):
+        """Re-pack the telemetry dict; fields whose bytes changed are stamped with a new sequence number."""
+        seq = self.seq + 1
+        dirty = False
+        for i, (name, _, _) in enumerate(self.schema):
+            if name not in telemetry: continue
+            packed = self.pack_field(i, telemetry[name])
+            if packed != self.packed[i]:
+                self.packed[i] = packed
+                self.changed_at[i] = seq
+                dirty = True
+        if dirty: self.seq = seq
+
+    def encode(self, since=0):
+        seq = self.seq
+        if since > seq: since = 0
+        out = [struct.pack("<II", self.epoch, seq)]
+        for i, packed in enumerate(self.packed):
+            if packed is not None and self.changed_at[i] > since:
+                out.append(bytes((i,)) + packed)
+        return b"".join(out)
+
+    def describe(self):
+        return {"version": 1, "epoch": self.epoch, "fields": [{"name": n, "format": f, "scale": sc} for n, f, sc in self.schema]}
+
+delta_feed = DeltaFeed(WIRE_SCHEMA)
+delta_feed.update(current_telemetry)
+
+# Per-source StreamHealth, keyed by "ip:port" (served at /stats)
+stream_health = {}
+
 DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
@@ -124,32 +343,82 @@ DASHBOARD_HTML = """
                 <!-- RR --> <div class="tire-box"> <div class="tire-header"> <span>RR</span> <span class="tire-temp" id="tire-rr-temp">0°</span> </div> <div class="tire-bar-bg"><div class="tire-bar" id="tire-rr-bar"></div></div> <span class="tire-val" id="tire-rr-val">100%</span> </div>
             </div>
         </div>
+        <div class="card"> <div class="label">Fuel Laps Left</div> <div class="value" id="fuel-laps-val">--</div> </div>
+        <div class="card" style="grid-column: span 2;"> <div class="label">Tire Laps Left (to %TIRE_LIMIT%%)</div> <div class="value" id="tire-laps-val">--</div> </div>
         <div id="rpm-bar-container"> <div id="rpm-bar"></div> </div>
     </div>
     <script>
         function formatTime(s) { if (!s || s <= 0) return "--:--"; let m = Math.floor(s/60), sec = Math.floor(s%60), ms = Math.floor((s*1000)%1000); return `${m}:${sec.toString().padStart(2,'0')}.${ms.toString().padStart(3,'0')}`; }
+        function formatLaps(n) { return (n === undefined || n < 0) ? '--' : n.toFixed(1); }
         function updateTire(id, pct, temp) {
             const elVal = document.getElementById(id+'-val'), elBar = document.getElementById(id+'-bar'), elTemp = document.getElementById(id+'-temp');
             elVal.innerText = pct.toFixed(0) + '%'; elTemp.innerText = temp + '°'; elBar.style.height = pct + '%';
             if (pct > 70) elBar.style.backgroundColor = '#00e676'; else if (pct > 40) elBar.style.backgroundColor = '#ffea00'; else elBar.style.backgroundColor = '#f44336';
             if (temp > 220) elTemp.style.color = '#f44336'; else if (temp < 100) elTemp.style.color = '#00e5ff'; else elTemp.style.color = '#fff';
         }
-        async function fetchData() {
+        function render(data) {
+            if (data.race_on) { document.getElementById('status-icon').className = 'status-on'; document.getElementById('status-text').innerText = "RACE ACTIVE"; } 
+            else { document.getElementById('status-icon').className = 'status-off'; document.getElementById('status-text').innerText = "PAUSED / MENU"; }
+            document.getElementById('gear-val').innerText = data.gear; document.getElementById('speed-val').innerText = data.speed;
+            document.getElementById('rpm-val').innerText = data.rpm; document.getElementById('pos-val').innerText = data.position;
+            document.getElementById('lap-val').innerText = data.lap; document.getElementById('best-lap-val').innerText = formatTime(data.best_lap);
+            if (data.tire_wear && data.tire_temp) {
+                updateTire('tire-fl', data.tire_wear[0], data.tire_temp[0]); updateTire('tire-fr', data.tire_wear[1], data.tire_temp[1]);
+                updateTire('tire-rl', data.tire_wear[2], data.tire_temp[2]); updateTire('tire-rr', data.tire_wear[3], data.tire_temp[3]);
+            }
+            let maxRpm = data.max_rpm || 8000; let pct = (data.rpm / maxRpm) * 100; document.getElementById('rpm-bar').style.width = pct + '%';
+            document.getElementById('fuel-laps-val').innerText = formatLaps(data.fuel_laps_left);
+            if (data.tire_laps_left) document.getElementById('tire-laps-val').innerText = data.tire_laps_left.map(formatLaps).join(' / ');
+        }
+        // Compact feed decoder: see WIRE_SCHEMA in main.py.
+        const SIZES = {B: 1, H: 2, h: 2, i: 4, f: 4, '?': 1};
+        let schema = null, epoch = null, seq = 0, state = {};
+        function readOne(dv, off, t) {
+            switch (t) { case 'B': return dv.getUint8(off); case 'H': return dv.getUint16(off, true); case 'h': return dv.getInt16(off, true);
+                         case 'i': return dv.getInt32(off, true); case 'f': return dv.getFloat32(off, true); case '?': return dv.getUint8(off) !== 0; }
+        }
+        function decode(buf) {
+            const dv = new DataView(buf); let off = 8;
+            // Server restarted: fields may have changed before our old seq, so refetch everything
+            if (dv.getUint32(0, true) !== epoch) { schema = null; seq = 0; state = {}; return false; }
+            seq = dv.getUint32(4, true);
+            while (off < buf.byteLength) {
+                const f = schema[dv.getUint8(off)]; off += 1;
+                if (f.type === 's') { state[f.name] = new TextDecoder().decode(new Uint8Array(buf, off, f.count)).replace(/\\0+$/, ''); off += f.count; continue; }
+                const vals = [];
+                for (let k = 0; k < f.count; k++) { let v = readOne(dv, off, f.type); if (f.type !== 'f' && f.type !== '?') v /= f.scale; vals.push(v); off += SIZES[f.type]; }
+                state[f.name] = f.count > 1 ? vals : vals[0];
+            }
+            return true;
+        }
+        async function loadSchema() {
+            const res = await fetch('/schema');
+            const desc = await res.json(); epoch = desc.epoch;
+            schema = desc.fields.map(f => { const m = f.format.match(/^(\\d*)(.)$/); return {name: f.name, scale: f.scale, count: parseInt(m[1] || '1'), type: m[2]}; });
+        }
+        // /stream pushes length-prefixed delta frames over one response; reconnects if it drops
+        async function streamData() {
             try {
-                const res = await fetch('/data'); const data = await res.json();
-                if (data.race_on) { document.getElementById('status-icon').className = 'status-on'; document.getElementById('status-text').innerText = "RACE ACTIVE"; } 
-                else { document.getElementById('status-icon').className = 'status-off'; document.getElementById('status-text').innerText = "PAUSED / MENU"; }
-                document.getElementById('gear-val').innerText = data.gear; document.getElementById('speed-val').innerText = data.speed;
-                document.getElementById('rpm-val').innerText = data.rpm; document.getElementById('pos-val').innerText = data.position;
-                document.getElementById('lap-val').innerText = data.lap; document.getElementById('best-lap-val').innerText = formatTime(data.best_lap);
-                if (data.tire_wear && data.tire_temp) {
-                    updateTire('tire-fl', data.tire_wear[0], data.tire_temp[0]); updateTire('tire-fr', data.tire_wear[1], data.tire_temp[1]);
-                    updateTire('tire-rl', data.tire_wear[2], data.tire_temp[2]); updateTire('tire-rr', data.tire_wear[3], data.tire_temp[3]);
+                if (!schema) await loadSchema();
+                const res = await fetch('/stream?since=' + seq); const reader = res.body.getReader();
+                let pending = new Uint8Array(0);
+                while (true) {
+                    const { value, done } = await reader.read(); if (done) break;
+                    const joined = new Uint8Array(pending.length + value.length); joined.set(pending); joined.set(value, pending.length); pending = joined;
+                    while (pending.length >= 2) {
+                        const len = pending[0] | (pending[1] << 8); if (pending.length < 2 + len) break;
+                        const frame = pending.slice(2, 2 + len); pending = pending.slice(2 + len);
+                        if (decode(frame.buffer)) render(state); else { reader.cancel(); return setTimeout(streamData, 0); }
+                    }
                 }
-                let maxRpm = data.max_rpm || 8000; let pct = (data.rpm / maxRpm) * 100; document.getElementById('rpm-bar').style.width = pct + '%';
             } catch (e) { console.error(e); }
+            setTimeout(streamData, 1000);
         }
-        setInterval(fetchData, 100);
+        async function fetchData() {
+            try { const res = await fetch('/data'); render(await res.json()); } catch (e) { console.error(e); }
+        }
+        // Add ?json to the URL to poll the plain JSON /data endpoint instead of the compact stream
+        if (location.search.includes('json')) setInterval(fetchData, 100); else streamData();
     </script>
 </body>
 </html>
@@ -213,19 +482,60 @@ class Commentator:
         return None
 
 class TelemetryRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so pollers don't open a new TCP connection every 100 ms
+    protocol_version = "HTTP/1.1"
+
+    def send_response(self, code, message=None):
+        # Skip the Server and Date headers; on a 14 byte delta they are most of the response
+        self.log_request(code)
+        self.send_response_only(code, message)
+
+    def send_body(self, body, content_type):
+        self.send_response(200); self.send_header('Content-type', content_type); self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*'); self.end_headers()
+        self.wfile.write(body)
+
     def do_GET(self):
-        if self.path == '/data':
-            self.send_response(200); self.send_header('Content-type', 'application/json'); self.send_header('Access-Control-Allow-Origin', '*'); self.end_headers()
-            self.wfile.write(json.dumps(current_telemetry).encode())
-        elif self.path == '/' or self.path == '/dashboard.html':
-            self.send_response(200); self.send_header('Content-type', 'text/html'); self.end_headers()
-            self.wfile.write(DASHBOARD_HTML.encode('utf-8'))
+        url = urlsplit(self.path)
+        if url.path in ('/delta', '/stream'):
+            try: since = int(parse_qs(url.query).get('since', ['0'])[0])
+            except ValueError: since = 0
+        if url.path == '/data':
+            self.send_body(json.dumps(current_telemetry).encode(), 'application/json')
+        elif url.path == '/delta':
+            self.send_body(delta_feed.encode(since), 'application/octet-stream')
+        elif url.path == '/stream':
+            self.stream_delta(since)
+        elif url.path == '/stats':
+            self.send_body(json.dumps({src: h.summary() for src, h in list(stream_health.items())}).encode(), 'application/json')
+        elif url.path == '/schema':
+            self.send_body(json.dumps(delta_feed.describe()).encode(), 'application/json')
+        elif url.path == '/' or url.path == '/dashboard.html':
+            self.send_body(DASHBOARD_HTML.replace('%TIRE_LIMIT%', f"{STRATEGY_TIRE_LIMIT:g}").encode('utf-8'), 'text/html')
         else: self.send_error(404)
+
+    def stream_delta(self, since):
+        self.send_response(200); self.send_header('Content-type', 'application/octet-stream'); self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Cache-Control', 'no-cache'); self.send_header('Access-Control-Allow-Origin', '*'); self.end_headers()
+        self.close_connection = True
+        seq = None
+        try:
+            while True:
+                if delta_feed.seq != seq:
+                    frame = delta_feed.encode(since)
+                    seq = since = struct.unpack_from("<I", frame, 4)[0]
+                    chunk = struct.pack("<H", len(frame)) + frame
+                    self.wfile.write(b"%X\r\n%s\r\n" % (len(chunk), chunk))
+                    self.wfile.flush()
+                time.sleep(DELTA_STREAM_MS / 1000)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
     def log_message(self, format, *args): return
 
 def run_web_mode():
     def start_web_server():
-        server = HTTPServer(("", WEB_PORT), TelemetryRequestHandler)
+        server = ThreadingHTTPServer(("", WEB_PORT), TelemetryRequestHandler)
         print(f"🌐 Web Dashboard active at http://localhost:{WEB_PORT}/")
         server.serve_forever()
 
@@ -238,6 +548,7 @@ def run_web_mode():
     print(f"🎧 Listening for UDP telemetry on {UDP_IP}:{UDP_PORT}...")
     
     commentator = Commentator()
+    strategy = StrategyPredictor()
     csv_file = None
     csv_writer = None
     racing_active = False
@@ -248,6 +559,20 @@ def run_web_mode():
             packet = TelemetryData(data)
             if not packet.valid: continue
 
+            # Stream health: drop duplicates and stale reordered packets, remember gaps for the log
+            source = f"{addr[0]}:{addr[1]}"
+            health = stream_health.get(source)
+            if health is None: health = stream_health[source] = StreamHealth()
+            status, missing_before = health.observe(packet.timestamp_ms, time.monotonic())
+            if status in ("duplicate", "late"): continue
+            if status == "filled":
+                # Too old for the dashboard, but it belongs in the log; -1 marks it as out of order
+                if csv_writer:
+                    row = packet.to_dict()
+                    row["missing_before"] = -1
+                    csv_writer.writerow(row)
+                continue
+
             # Update Web Data
             gear_str = commentator.get_gear_display(packet.input_gear)
             mph = packet.speed * 2.23694
@@ -266,6 +591,10 @@ def run_web_mode():
             current_telemetry["race_on"] = bool(packet.is_race_on)
             current_telemetry["tire_wear"] = tire_health
             current_telemetry["tire_temp"] = [int(t) for t in packet.tire_temp]
+            if packet.is_race_on:
+                strategy.update(packet)
+                current_telemetry.update(strategy.predict())
+            delta_feed.update(current_telemetry)
 
             # Logging
             if packet.is_race_on:
@@ -276,9 +605,12 @@ def run_web_mode():
                     print(f"\n📝 Race started! Logging to {filename}")
                     csv_file = open(filename, 'w', newline='')
                     packet_dict = packet.to_dict()
-                    csv_writer = csv.DictWriter(csv_file, fieldnames=packet_dict.keys())
+                    csv_writer = csv.DictWriter(csv_file, fieldnames=list(packet_dict.keys()) + ["missing_before"])
                     csv_writer.writeheader()
-                if csv_writer: csv_writer.writerow(packet.to_dict())
+                if csv_writer:
+                    row = packet.to_dict()
+                    row["missing_before"] = missing_before
+                    csv_writer.writerow(row)
             else:
                 if racing_active:
                     racing_active = False
@@ -294,122 +626,197 @@ def run_web_mode():
 
     except KeyboardInterrupt:
         if csv_file: csv_file.close()
+        for source, health in stream_health.items():
+            h = health.summary()
+            print(f"📶 {source}: {h['packets']} packets, {h['missing']} missing ({h['loss_pct']}%), "
+                  f"{h['duplicates']} duplicates, {h['reordered']} reordered, jitter {h['jitter_ms']} ms")
         print("\n🛑 Stopped.")
 
 # ==========================================
 # MODE 2: TRANSPARENT OVERLAY
 # ==========================================
 
-if TKINTER_AVAILABLE:
-    class OverlayApp:
-        def __init__(self, root):
-            self.root = root
-            self.root.title("Forza Overlay")
-            
-            # Dynamic positioning: Right side of screen
-            screen_width = self.root.winfo_screenwidth()
-            window_width = 300
-            # Calculate position: Screen Width - Window Width - 50px Padding
-            x_pos = screen_width - window_width - 50 
-            
-            self.root.geometry(f"{window_width}x450+{x_pos}+{OVERLAY_Y}")
-            
-            self.root.overrideredirect(True)
-            self.root.wm_attributes("-topmost", True)
-            self.bg_color = "#010101"
-            self.root.config(bg=self.bg_color)
-            self.root.wm_attributes("-transparentcolor", self.bg_color)
-            self.make_click_through()
-            self.setup_ui()
-            self.running = True
-            self.thread = threading.Thread(target=self.udp_loop)
-            self.thread.daemon = True
-            self.thread.start()
-            self.update_ui()
-
-        def make_click_through(self):
-            try:
-                hwnd = ctypes.windll.user32.GetParent(self.root.winfo_id())
-                style = ctypes.windll.user32.GetWindowLongW(hwnd, -20) # GWL_EXSTYLE
-                style = style | 0x00080000 | 0x00000020 # WS_EX_LAYERED | WS_EX_TRANSPARENT
-                ctypes.windll.user32.SetWindowLongW(hwnd, -20, style)
-            except Exception as e: print(f"Error setting click-through: {e}")
-
-        def setup_ui(self):
-            self.frame = tk.Frame(self.root, bg=self.bg_color)
-            self.frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            self.lbl_gear = tk.Label(self.frame, text="N", font=("Segoe UI", 60, "bold"), fg="#00e5ff", bg=self.bg_color)
-            self.lbl_gear.pack()
-            self.lbl_speed = tk.Label(self.frame, text="0 MPH", font=("Segoe UI", 24, "bold"), fg="#ffea00", bg=self.bg_color)
-            self.lbl_speed.pack()
-            self.lbl_rpm = tk.Label(self.frame, text="0 RPM", font=("Consolas", 14), fg="#cccccc", bg=self.bg_color)
-            self.lbl_rpm.pack()
-            info_frame = tk.Frame(self.frame, bg=self.bg_color)
-            info_frame.pack(pady=10)
-            self.lbl_pos = tk.Label(info_frame, text="POS: -", font=("Segoe UI", 12, "bold"), fg="white", bg=self.bg_color)
-            self.lbl_pos.grid(row=0, column=0, padx=10)
-            self.lbl_lap = tk.Label(info_frame, text="LAP: -", font=("Segoe UI", 12, "bold"), fg="white", bg=self.bg_color)
-            self.lbl_lap.grid(row=0, column=1, padx=10)
-            self.lbl_best = tk.Label(self.frame, text="Best: --:--", font=("Segoe UI", 10), fg="#00e676", bg=self.bg_color)
-            self.lbl_best.pack()
-            self.tire_canvas = tk.Canvas(self.frame, width=140, height=100, bg=self.bg_color, highlightthickness=0)
-            self.tire_canvas.pack(pady=15)
-            self.bars = []
-            positions = [(20, 10), (80, 10), (20, 55), (80, 55)]
-            for i, (x, y) in enumerate(positions):
-                self.tire_canvas.create_rectangle(x, y, x+15, y+40, outline="gray", width=1)
-                bar_id = self.tire_canvas.create_rectangle(x+1, y+39, x+14, y+39, fill="#00e676", outline="")
-                lbl_id = self.tire_canvas.create_text(x+25, y+20, text="100%", fill="white", font=("Arial", 8), anchor="w")
-                self.bars.append({'bar': bar_id, 'lbl': lbl_id, 'base_y': y+39, 'max_h': 38})
-
-        def format_time(self, seconds):
-            if not seconds or seconds <= 0: return "--:--"
-            m = int(seconds // 60); s = int(seconds % 60); ms = int((seconds * 1000) % 1000)
-            return f"{m}:{s:02}.{ms:03}"
-
-        def update_ui(self):
+class LatestSnapshot:
+    """Single-slot, lock-free handoff of the newest packet from the UDP thread to the UI.
+    The writer swaps in a fresh (seq, packet) tuple; reference assignment is atomic, so the
+    reader always sees a consistent pair without taking a lock."""
+    def __init__(self):
+        self._slot = (0, None)
+
+    def publish(self, packet):
+        self._slot = (self._slot[0] + 1, packet)
+
+    def read(self):
+        return self._slot
+
+def tire_color(pct):
+    if pct < 40: return "#f44336"
+    if pct < 70: return "#ffea00"
+    return "#00e676"
+
+def format_lap_time(seconds):
+    if not seconds or seconds <= 0: return "--:--"
+    m = int(seconds // 60); s = int(seconds % 60); ms = int((seconds * 1000) % 1000)
+    return f"{m}:{s:02}.{ms:03}"
+
+def format_laps_left(laps):
+    return "--" if laps < 0 else f"{laps:.1f}"
+
+def overlay_state(d, bar_max_h=38, strategy=None):
+    """Quantized display values for the overlay, keyed by widget. Equal values mean no redraw."""
+    g = str(d.input_gear)
+    if d.input_gear == 0: g = "R"
+    elif d.input_gear == 11: g = "N"
+    rpm = int(round(d.cur_rpm / OVERLAY_RPM_STEP) * OVERLAY_RPM_STEP)
+    redline = d.max_rpm > 0 and (d.cur_rpm / d.max_rpm) > 0.95
+    state = {
+        "gear": g,
+        "speed": f"{d.speed * 2.23694:.0f} MPH",
+        "rpm": (f"{rpm} RPM", "red" if redline else "#cccccc"),
+        "pos": f"POS: {d.race_pos}",
+        "lap": f"LAP: {d.lap_number + 1}",
+        "best": f"Best: {format_lap_time(d.best_lap)}",
+    }
+    if strategy is not None:
+        tires = [t for t in strategy["tire_laps_left"] if t >= 0]
+        state["strategy"] = f"Fuel: {format_laps_left(strategy['fuel_laps_left'])} laps  Tires: {format_laps_left(min(tires) if tires else -1)} laps"
+    for i, wear in enumerate(d.tire_wear):
+        pct = int(max(0, min(100, (1.0 - wear) * 100)))
+        state[f"tire{i}"] = (pct, round(pct / 100 * bar_max_h), tire_color(pct))
+    return state
+
+class OverlayRenderModel:
+    """Tracks what is currently on screen and returns only the entries that changed."""
+    def __init__(self, bar_max_h=38):
+        self.bar_max_h = bar_max_h
+        self.shown = {}
+
+    def diff(self, packet, strategy=None):
+        changed = {}
+        for key, value in overlay_state(packet, self.bar_max_h, strategy).items():
+            if self.shown.get(key) != value:
+                changed[key] = value
+        self.shown.update(changed)
+        return changed
+
+def load_gui():
+    """Import Tkinter and ctypes on first use. Returns False if they are unavailable."""
+    global tk, ctypes
+    if tk is not None: return True
+    try:
+        import tkinter
+        import ctypes as _ctypes
+    except ImportError:
+        return False
+    tk, ctypes = tkinter, _ctypes
+    return True
+
+class OverlayApp:
+    def __init__(self, root, frame_ms=None):
+        self.root = root
+        self.root.title("Forza Overlay")
+        self.frame_ms = frame_ms if frame_ms is not None else OVERLAY_FRAME_MS
+        self.snapshot = LatestSnapshot()
+        self.render_model = OverlayRenderModel()
+        self.strategy = StrategyPredictor()
+        self.rendered_seq = 0
+        
+        # Dynamic positioning: Right side of screen
+        screen_width = self.root.winfo_screenwidth()
+        window_width = 300
+        # Calculate position: Screen Width - Window Width - 50px Padding
+        x_pos = screen_width - window_width - 50 
+        
+        self.root.geometry(f"{window_width}x480+{x_pos}+{OVERLAY_Y}")
+        
+        self.root.overrideredirect(True)
+        self.root.wm_attributes("-topmost", True)
+        self.bg_color = "#010101"
+        self.root.config(bg=self.bg_color)
+        self.root.wm_attributes("-transparentcolor", self.bg_color)
+        self.make_click_through()
+        self.setup_ui()
+        self.running = True
+        self.thread = threading.Thread(target=self.udp_loop)
+        self.thread.daemon = True
+        self.thread.start()
+        self.update_ui()
+
+    def make_click_through(self):
+        try:
+            hwnd = ctypes.windll.user32.GetParent(self.root.winfo_id())
+            style = ctypes.windll.user32.GetWindowLongW(hwnd, -20) # GWL_EXSTYLE
+            style = style | 0x00080000 | 0x00000020 # WS_EX_LAYERED | WS_EX_TRANSPARENT
+            ctypes.windll.user32.SetWindowLongW(hwnd, -20, style)
+        except Exception as e: print(f"Error setting click-through: {e}")
+
+    def setup_ui(self):
+        self.frame = tk.Frame(self.root, bg=self.bg_color)
+        self.frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.lbl_gear = tk.Label(self.frame, text="N", font=("Segoe UI", 60, "bold"), fg="#00e5ff", bg=self.bg_color)
+        self.lbl_gear.pack()
+        self.lbl_speed = tk.Label(self.frame, text="0 MPH", font=("Segoe UI", 24, "bold"), fg="#ffea00", bg=self.bg_color)
+        self.lbl_speed.pack()
+        self.lbl_rpm = tk.Label(self.frame, text="0 RPM", font=("Consolas", 14), fg="#cccccc", bg=self.bg_color)
+        self.lbl_rpm.pack()
+        info_frame = tk.Frame(self.frame, bg=self.bg_color)
+        info_frame.pack(pady=10)
+        self.lbl_pos = tk.Label(info_frame, text="POS: -", font=("Segoe UI", 12, "bold"), fg="white", bg=self.bg_color)
+        self.lbl_pos.grid(row=0, column=0, padx=10)
+        self.lbl_lap = tk.Label(info_frame, text="LAP: -", font=("Segoe UI", 12, "bold"), fg="white", bg=self.bg_color)
+        self.lbl_lap.grid(row=0, column=1, padx=10)
+        self.lbl_best = tk.Label(self.frame, text="Best: --:--", font=("Segoe UI", 10), fg="#00e676", bg=self.bg_color)
+        self.lbl_best.pack()
+        self.lbl_strategy = tk.Label(self.frame, text="Fuel: -- laps  Tires: -- laps", font=("Segoe UI", 10), fg="#cccccc", bg=self.bg_color)
+        self.lbl_strategy.pack()
+        self.tire_canvas = tk.Canvas(self.frame, width=140, height=100, bg=self.bg_color, highlightthickness=0)
+        self.tire_canvas.pack(pady=15)
+        self.bars = []
+        positions = [(20, 10), (80, 10), (20, 55), (80, 55)]
+        for i, (x, y) in enumerate(positions):
+            self.tire_canvas.create_rectangle(x, y, x+15, y+40, outline="gray", width=1)
+            bar_id = self.tire_canvas.create_rectangle(x+1, y+39, x+14, y+39, fill="#00e676", outline="")
+            lbl_id = self.tire_canvas.create_text(x+25, y+20, text="100%", fill="white", font=("Arial", 8), anchor="w")
+            self.bars.append({'bar': bar_id, 'lbl': lbl_id, 'x0': x+1, 'x1': x+14, 'base_y': y+39, 'max_h': 38})
+
+    def update_ui(self):
+        try:
+            seq, latest = self.snapshot.read()
+            if latest is not None and seq != self.rendered_seq:
+                self.rendered_seq = seq
+                self.apply_changes(self.render_model.diff(*latest))
+        except Exception as e: print(f"UI Error: {e}")
+        self.root.after(self.frame_ms, self.update_ui)
+
+    def apply_changes(self, changes):
+        labels = {"gear": self.lbl_gear, "speed": self.lbl_speed, "pos": self.lbl_pos, "lap": self.lbl_lap, "best": self.lbl_best, "strategy": self.lbl_strategy}
+        for key, value in changes.items():
+            if key in labels:
+                labels[key].config(text=value)
+            elif key == "rpm":
+                self.lbl_rpm.config(text=value[0], fg=value[1])
+            else:
+                pct, bar_h, color = value
+                b = self.bars[int(key[4:])]
+                self.tire_canvas.itemconfig(b['lbl'], text=f"{pct}%")
+                self.tire_canvas.coords(b['bar'], b['x0'], b['base_y'] - bar_h, b['x1'], b['base_y'])
+                self.tire_canvas.itemconfig(b['bar'], fill=color)
+
+    def udp_loop(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((UDP_IP, UDP_PORT))
+        print(f"Overlay listening on port {UDP_PORT}")
+        while self.running:
             try:
-                if hasattr(self, 'current_data'):
-                    d = self.current_data
-                    g = str(d.input_gear)
-                    if d.input_gear == 0: g = "R"
-                    elif d.input_gear == 11: g = "N"
-                    self.lbl_gear.config(text=g)
-                    mph = d.speed * 2.23694
-                    self.lbl_speed.config(text=f"{mph:.0f} MPH")
-                    self.lbl_rpm.config(text=f"{int(d.cur_rpm)} RPM")
-                    if d.max_rpm > 0 and (d.cur_rpm / d.max_rpm) > 0.95: self.lbl_rpm.config(fg="red")
-                    else: self.lbl_rpm.config(fg="#cccccc")
-                    self.lbl_pos.config(text=f"POS: {d.race_pos}")
-                    self.lbl_lap.config(text=f"LAP: {d.lap_number + 1}")
-                    self.lbl_best.config(text=f"Best: {self.format_time(d.best_lap)}")
-                    for i, wear in enumerate(d.tire_wear):
-                        pct = max(0, min(100, (1.0 - wear) * 100))
-                        self.tire_canvas.itemconfig(self.bars[i]['lbl'], text=f"{int(pct)}%")
-                        bar_h = (pct / 100) * self.bars[i]['max_h']
-                        base_y = self.bars[i]['base_y']
-                        c = self.tire_canvas.coords(self.bars[i]['bar'])
-                        self.tire_canvas.coords(self.bars[i]['bar'], c[0], base_y - bar_h, c[2], base_y)
-                        color = "#00e676"
-                        if pct < 70: color = "#ffea00"
-                        if pct < 40: color = "#f44336"
-                        self.tire_canvas.itemconfig(self.bars[i]['bar'], fill=color)
-            except Exception as e: print(f"UI Error: {e}")
-            self.root.after(33, self.update_ui)
-
-        def udp_loop(self):
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.bind((UDP_IP, UDP_PORT))
-            print(f"Overlay listening on port {UDP_PORT}")
-            while self.running:
-                try:
-                    data, _ = sock.recvfrom(1024)
-                    packet = TelemetryData(data)
-                    if packet.valid and packet.is_race_on: self.current_data = packet
-                except Exception: pass
+                data, _ = sock.recvfrom(1024)
+                packet = TelemetryData(data)
+                if packet.valid and packet.is_race_on:
+                    self.strategy.update(packet)
+                    self.snapshot.publish((packet, self.strategy.predict()))
+            except Exception: pass
 
 def run_overlay_mode():
-    if not TKINTER_AVAILABLE:
+    if not load_gui():
         print("Error: Tkinter not installed or not supported on this OS.")
         return
     if os.name != 'nt':
@@ -424,10 +831,147 @@ def run_overlay_mode():
         print("Closing...")
 
 # ==========================================
-# MAIN MENU
+# MODE 3: RELAY, CAPTURE, REPLAY & BENCH
 # ==========================================
 
-if __name__ == "__main__":
+# Capture files: magic header, then one record per packet of
+# (arrival time as float64 seconds, payload length as uint16) followed by the raw payload.
+CAPTURE_MAGIC = b"FZCAP1\n"
+CAPTURE_RECORD = struct.Struct("<dH")
+
+def parse_target(text):
+    host, _, port = text.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+def run_relay_mode(targets):
+    """Forward every UDP packet unchanged to each host:port target (e.g. a second PC running the overlay)."""
+    targets = [parse_target(t) for t in targets]
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((UDP_IP, UDP_PORT))
+    out = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    print(f"🔁 Relaying {UDP_IP}:{UDP_PORT} -> " + ", ".join(f"{h}:{p}" for h, p in targets))
+    try:
+        while True:
+            data, _ = sock.recvfrom(1024)
+            for target in targets: out.sendto(data, target)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped.")
+
+def run_capture_mode(path, count=None):
+    """Record raw packets with their arrival times so a session can be replayed later."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((UDP_IP, UDP_PORT))
+    print(f"⏺️ Capturing {UDP_IP}:{UDP_PORT} to {path}")
+    written = 0
+    with open(path, 'wb') as f:
+        f.write(CAPTURE_MAGIC)
+        try:
+            while count is None or written < count:
+                data, _ = sock.recvfrom(1024)
+                f.write(CAPTURE_RECORD.pack(time.time(), len(data)))
+                f.write(data)
+                written += 1
+        except KeyboardInterrupt:
+            pass
+    print(f"\n📝 Captured {written} packets.")
+    return written
+
+def iter_capture(path):
+    """Yield (arrival_time, payload) pairs from a capture file."""
+    with open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a telemetry capture file")
+        while True:
+            header = f.read(CAPTURE_RECORD.size)
+            if len(header) < CAPTURE_RECORD.size: return
+            t, length = CAPTURE_RECORD.unpack(header)
+            yield t, f.read(length)
+
+def run_replay_mode(path, target, speed=1.0):
+    """Send a capture back out over UDP, preserving the original packet spacing (scaled by speed)."""
+    host, port = parse_target(target)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    print(f"▶️ Replaying {path} to {host}:{port} at {speed}x")
+    sent = 0
+    start_wall = time.monotonic()
+    first = None
+    try:
+        for t, data in iter_capture(path):
+            if first is None: first = t
+            if speed > 0:
+                delay = (t - first) / speed - (time.monotonic() - start_wall)
+                if delay > 0: time.sleep(delay)
+            sock.sendto(data, (host, port))
+            sent += 1
+    except KeyboardInterrupt:
+        pass
+    print(f"Sent {sent} packets.")
+    return sent
+
+def run_bench_mode(count=100000):
+    """Measure parse and overlay-state throughput on a synthetic packet."""
+    data = bytearray(331)
+    struct.pack_into("<i", data, 0, 1)
+    struct.pack_into("<3f", data, 8, 8000.0, 1000.0, 4000.0)
+    data = bytes(data)
+    results = {}
+    for name, fn in (("parse", lambda: TelemetryData(data)),
+                     ("overlay_state", lambda p=TelemetryData(data): overlay_state(p)),
+                     ("strategy", lambda p=TelemetryData(data), sp=StrategyPredictor(): (sp.update(p), sp.predict()))):
+        t0 = time.perf_counter()
+        for _ in range(count): fn()
+        elapsed = time.perf_counter() - t0
+        results[name] = count / elapsed
+        print(f"{name:>14}: {results[name]:>12,.0f} packets/s ({elapsed * 1e6 / count:.2f} us/packet)")
+    return results
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+
+CONFIG_KEYS = ("udp_ip", "udp_port", "web_port", "overlay_y", "overlay_frame_ms", "overlay_rpm_step",
+               "strategy_tire_limit", "strategy_alpha", "strategy_join_s")
+
+def apply_config(config):
+    """Override the module-level configuration from a dict of lowercase keys (as in a --config JSON file)."""
+    unknown = set(config) - set(CONFIG_KEYS)
+    if unknown: raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+    for key, value in config.items():
+        expected = type(globals()[key.upper()])
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"Config key {key} must be {expected.__name__}, got {value!r}")
+        try:
+            converted = expected(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Config key {key} must be {expected.__name__}, got {value!r}")
+        if expected is int and isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"Config key {key} must be int, got {value!r}")
+        globals()[key.upper()] = converted
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Forza telemetry toolkit.")
+    parser.add_argument("--config", help="JSON file with any of: " + ", ".join(CONFIG_KEYS))
+    parser.add_argument("--udp-ip", dest="udp_ip")
+    parser.add_argument("--udp-port", dest="udp_port", type=int)
+    parser.add_argument("--web-port", dest="web_port", type=int)
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("web", help="Web dashboard + CSV logger + commentary (headless)")
+    overlay = sub.add_parser("overlay", help="Transparent Windows overlay")
+    overlay.add_argument("--frame-ms", dest="overlay_frame_ms", type=int)
+    relay = sub.add_parser("relay", help="Forward packets to other host:port targets")
+    relay.add_argument("targets", nargs="+", metavar="HOST:PORT")
+    capture = sub.add_parser("capture", help="Record raw packets to a capture file")
+    capture.add_argument("path")
+    capture.add_argument("--count", type=int)
+    replay = sub.add_parser("replay", help="Replay a capture file over UDP")
+    replay.add_argument("path")
+    replay.add_argument("--target", help="HOST:PORT to send to (default: 127.0.0.1 and the configured UDP port)")
+    replay.add_argument("--speed", type=float, default=1.0, help="Playback rate; 0 sends as fast as possible")
+    bench = sub.add_parser("bench", help="Benchmark packet processing")
+    bench.add_argument("--count", type=int, default=100000)
+    return parser
+
+def interactive_menu():
     print("=========================================")
     print("  FORZA TELEMETRY TOOLKIT")
     print("=========================================")
@@ -444,4 +988,31 @@ if __name__ == "__main__":
         print("\nLaunching Overlay Mode...")
         run_overlay_mode()
     else:
-        print("Invalid choice. Exiting.")
\ No newline at end of file
+        print("Invalid choice. Exiting.")
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.config:
+        with open(args.config) as f: apply_config(json.load(f))
+    apply_config({k: v for k, v in vars(args).items() if k in CONFIG_KEYS and v is not None})
+    # Supervisors stop services with SIGTERM; treat it like Ctrl+C so logs get closed.
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+
+    if args.command is None:
+        if not sys.stdin.isatty():
+            build_parser().print_help()
+            return 2
+        interactive_menu()
+    elif args.command == "web": run_web_mode()
+    elif args.command == "overlay": run_overlay_mode()
+    elif args.command == "relay": run_relay_mode(args.targets)
+    elif args.command == "capture": run_capture_mode(args.path, args.count)
+    elif args.command == "replay": run_replay_mode(args.path, args.target or f"127.0.0.1:{UDP_PORT}", args.speed)
+    elif args.command == "bench": run_bench_mode(args.count)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
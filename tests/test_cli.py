@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path to import main
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.saved = {k: getattr(main, k.upper()) for k in main.CONFIG_KEYS}
+
+    def tearDown(self):
+        main.apply_config(self.saved)
+
+    def test_gui_not_imported_at_startup(self):
+        self.assertIsNone(main.tk)
+        self.assertIsNone(main.ctypes)
+
+    def test_subcommand_parsing(self):
+        args = main.build_parser().parse_args(["--udp-port", "5400", "relay", "10.0.0.2:5300", ":5301"])
+        self.assertEqual(args.command, "relay")
+        self.assertEqual(args.udp_port, 5400)
+        self.assertEqual([main.parse_target(t) for t in args.targets], [("10.0.0.2", 5300), ("127.0.0.1", 5301)])
+
+    def test_config_file_then_flags(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({"udp_port": 6000, "web_port": 9000}, f)
+        try:
+            with patch('main.signal.signal') as mock_signal, patch('main.run_bench_mode') as mock_bench:
+                main.main(["--config", f.name, "--web-port", "9100", "bench", "--count", "1"])
+            mock_signal.assert_called_once()
+            mock_bench.assert_called_once_with(1)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(main.UDP_PORT, 6000)
+        self.assertEqual(main.WEB_PORT, 9100)
+
+    def test_unknown_config_key(self):
+        with self.assertRaises(ValueError):
+            main.apply_config({"web_prot": 1})
+
+    def test_config_values_converted_to_default_type(self):
+        main.apply_config({"udp_port": "5400", "overlay_frame_ms": 50.0})
+        self.assertEqual(main.UDP_PORT, 5400)
+        self.assertIsInstance(main.OVERLAY_FRAME_MS, int)
+        for bad in ({"udp_port": "abc"}, {"web_port": None}, {"web_port": True}, {"overlay_y": 1.5}):
+            with self.assertRaises(ValueError):
+                main.apply_config(bad)
+
+    def test_capture_round_trip(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(main.CAPTURE_MAGIC)
+            for t, payload in ((1.0, b'abc'), (1.5, b'\x00' * 331)):
+                f.write(main.CAPTURE_RECORD.pack(t, len(payload)) + payload)
+        try:
+            records = list(main.iter_capture(f.name))
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(records, [(1.0, b'abc'), (1.5, b'\x00' * 331)])
+
+if __name__ == '__main__':
+    unittest.main()
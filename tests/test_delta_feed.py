@@ -0,0 +1,126 @@
+import struct
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import main
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http.client
+import threading
+from http.server import ThreadingHTTPServer
+
+from main import DeltaFeed, WIRE_SCHEMA, TelemetryRequestHandler
+
+class TestDeltaFeed(unittest.TestCase):
+    def make_telemetry(self, **overrides):
+        t = {"rpm": 4000, "max_rpm": 8000, "speed": 67.1, "gear": "3", "position": 2, "lap": 1,
+             "best_lap": 0.0, "track_id": 0, "race_on": True,
+             "tire_wear": [100.0, 100.0, 100.0, 100.0], "tire_temp": [180, 180, 180, 180],
+             "tire_laps_left": [-1.0, -1.0, -1.0, -1.0], "fuel_laps_left": 12.3}
+        t.update(overrides)
+        return t
+
+    def decode(self, frame):
+        epoch, seq = struct.unpack_from("<II", frame)
+        self.assertEqual(epoch, self.feed_epoch)
+        off, fields = 8, {}
+        while off < len(frame):
+            i = frame[off]; off += 1
+            s = struct.Struct("<" + WIRE_SCHEMA[i][1])
+            fields[WIRE_SCHEMA[i][0]] = s.unpack_from(frame, off); off += s.size
+        return seq, fields
+
+    def test_full_frame_for_new_client(self):
+        feed = DeltaFeed(WIRE_SCHEMA)
+        self.feed_epoch = feed.epoch
+        feed.update(self.make_telemetry())
+        seq, fields = self.decode(feed.encode(0))
+        self.assertEqual(seq, 1)
+        self.assertEqual(len(fields), len(WIRE_SCHEMA))
+        self.assertEqual(fields["speed"], (671,))
+        self.assertEqual(fields["gear"], (b"3\x00",))
+        self.assertEqual(fields["tire_temp"], (180, 180, 180, 180))
+        self.assertEqual(fields["fuel_laps_left"], (123,))
+
+    def test_only_changed_fields_after_seq(self):
+        feed = DeltaFeed(WIRE_SCHEMA)
+        self.feed_epoch = feed.epoch
+        feed.update(self.make_telemetry())
+        feed.update(self.make_telemetry(rpm=4500))
+        seq, fields = self.decode(feed.encode(1))
+        self.assertEqual(seq, 2)
+        self.assertEqual(fields, {"rpm": (4500,)})
+
+    def test_unchanged_update_keeps_seq(self):
+        feed = DeltaFeed(WIRE_SCHEMA)
+        self.feed_epoch = feed.epoch
+        feed.update(self.make_telemetry())
+        feed.update(self.make_telemetry(speed=67.12))
+        self.assertEqual(feed.encode(1), struct.pack("<II", feed.epoch, 1))
+
+    def test_out_of_range_values_are_clamped(self):
+        feed = DeltaFeed(WIRE_SCHEMA)
+        self.feed_epoch = feed.epoch
+        feed.update(self.make_telemetry(rpm=70000, max_rpm=-5, lap=65536, speed=float('nan'),
+                                        best_lap=float('inf'), tire_temp=[40000, -40000, float('nan'), 20],
+                                        fuel_laps_left=4000))
+        _, fields = self.decode(feed.encode(0))
+        self.assertEqual(fields["rpm"], (65535,))
+        self.assertEqual(fields["max_rpm"], (0,))
+        self.assertEqual(fields["lap"], (65535,))
+        self.assertEqual(fields["speed"], (0,))
+        self.assertEqual(fields["best_lap"], (-1.0,))
+        self.assertEqual(fields["tire_temp"], (32767, -32768, -1, 20))
+        self.assertEqual(fields["fuel_laps_left"], (32767,))
+
+    def test_epoch_in_schema(self):
+        feed = DeltaFeed(WIRE_SCHEMA)
+        self.assertEqual(feed.describe()["epoch"], feed.epoch)
+
+    def test_module_feed_seeded_before_first_packet(self):
+        import main
+        self.assertGreaterEqual(main.delta_feed.seq, 1)
+        self.assertGreater(len(main.delta_feed.encode(0)), 8)
+
+    def test_stale_client_gets_everything(self):
+        feed = DeltaFeed(WIRE_SCHEMA)
+        self.feed_epoch = feed.epoch
+        feed.update(self.make_telemetry())
+        _, fields = self.decode(feed.encode(99))
+        self.assertEqual(len(fields), len(WIRE_SCHEMA))
+
+class TestDeltaEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), TelemetryRequestHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_polls_reuse_connection(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=2)
+        for path in ("/schema", "/delta?since=0", "/data"):
+            conn.request("GET", path)
+            res = conn.getresponse()
+            body = res.read()
+            self.assertEqual(res.status, 200)
+            self.assertEqual(int(res.getheader("Content-Length")), len(body))
+            self.assertIsNone(res.getheader("Server"))
+        self.assertIsNotNone(conn.sock)
+        conn.close()
+
+    def test_stream_sends_length_prefixed_frames(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=2)
+        conn.request("GET", "/stream?since=0")
+        res = conn.getresponse()
+        self.assertEqual(res.getheader("Transfer-Encoding"), "chunked")
+        length = struct.unpack("<H", res.read(2))[0]
+        frame = res.read(length)
+        self.assertGreater(len(frame), 8)
+        conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
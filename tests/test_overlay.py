@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path to import main
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import LatestSnapshot, OverlayRenderModel
+
+class TestOverlayRender(unittest.TestCase):
+    def make_packet(self, **overrides):
+        fields = {
+            'input_gear': 3, 'speed': 30.0, 'cur_rpm': 4000.0, 'max_rpm': 8000.0,
+            'race_pos': 1, 'lap_number': 0, 'best_lap': 0.0,
+            'tire_wear': (0.0, 0.0, 0.0, 0.0),
+        }
+        fields.update(overrides)
+        return SimpleNamespace(**fields)
+
+    def test_first_frame_draws_everything(self):
+        model = OverlayRenderModel()
+        changes = model.diff(self.make_packet())
+        self.assertEqual(changes['gear'], "3")
+        self.assertEqual(changes['speed'], "67 MPH")
+        self.assertEqual(changes['rpm'], ("4000 RPM", "#cccccc"))
+        self.assertEqual(changes['tire0'], (100, 38, "#00e676"))
+        self.assertEqual(len(changes), 10)
+
+    def test_identical_frame_draws_nothing(self):
+        model = OverlayRenderModel()
+        model.diff(self.make_packet())
+        self.assertEqual(model.diff(self.make_packet(cur_rpm=4010.0, speed=30.01)), {})
+
+    def test_only_changed_widgets(self):
+        model = OverlayRenderModel()
+        model.diff(self.make_packet())
+        changes = model.diff(self.make_packet(input_gear=4, tire_wear=(0.5, 0.0, 0.0, 0.0)))
+        self.assertEqual(set(changes), {'gear', 'tire0'})
+        self.assertEqual(changes['tire0'], (50, 19, "#ffea00"))
+
+    def test_redline_color(self):
+        model = OverlayRenderModel()
+        changes = model.diff(self.make_packet(cur_rpm=7700.0))
+        self.assertEqual(changes['rpm'], ("7700 RPM", "red"))
+
+    def test_snapshot_handoff(self):
+        snap = LatestSnapshot()
+        self.assertEqual(snap.read(), (0, None))
+        snap.publish("a"); snap.publish("b")
+        self.assertEqual(snap.read(), (2, "b"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path to import main
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import StrategyPredictor, OverlayRenderModel
+
+class TestStrategyPredictor(unittest.TestCase):
+    def make_packet(self, lap, health, fuel, cur_lap=0.0):
+        wear = tuple(1.0 - h / 100 for h in health)
+        return SimpleNamespace(lap_number=lap, tire_wear=wear, fuel=fuel, cur_lap=cur_lap)
+
+    def drive(self, predictor, laps, wear_per_lap=5.0, fuel_per_lap=0.1, start_lap=0):
+        for lap in range(start_lap, start_lap + laps + 1):
+            done = lap - start_lap
+            predictor.update(self.make_packet(lap, [100 - wear_per_lap * done] * 4, 1.0 - fuel_per_lap * done))
+
+    def test_no_estimate_before_first_lap(self):
+        predictor = StrategyPredictor()
+        predictor.update(self.make_packet(0, [100] * 4, 1.0))
+        self.assertEqual(predictor.predict(), {"tire_laps_left": [-1.0] * 4, "fuel_laps_left": -1.0})
+
+    def test_constant_rates(self):
+        predictor = StrategyPredictor()
+        self.drive(predictor, 4)
+        # After 4 laps: 80% health, 0.6 fuel; 5%/lap and 0.1/lap
+        prediction = predictor.predict()
+        self.assertEqual(prediction["tire_laps_left"], [8.0] * 4)
+        self.assertEqual(prediction["fuel_laps_left"], 6.0)
+
+    def test_ewma_weights_recent_lap(self):
+        predictor = StrategyPredictor(alpha=0.5)
+        predictor.update(self.make_packet(0, [100] * 4, 1.0))
+        predictor.update(self.make_packet(1, [96] * 4, 0.9))
+        predictor.update(self.make_packet(2, [88] * 4, 0.8))
+        self.assertEqual(predictor.wear_rate, [6.0] * 4)
+
+    def test_lap_joined_in_progress_is_skipped(self):
+        predictor = StrategyPredictor()
+        predictor.update(self.make_packet(3, [90] * 4, 0.7, cur_lap=45.0))
+        predictor.update(self.make_packet(4, [88] * 4, 0.65))
+        self.assertIsNone(predictor.wear_rate)
+        self.assertIsNone(predictor.fuel_rate)
+        predictor.update(self.make_packet(5, [83] * 4, 0.55))
+        self.assertEqual(predictor.wear_rate, [5.0] * 4)
+        self.assertAlmostEqual(predictor.fuel_rate, 0.1)
+
+    def test_pit_stop_skips_tire_sample(self):
+        predictor = StrategyPredictor()
+        self.drive(predictor, 2)
+        predictor.update(self.make_packet(3, [100] * 4, 0.5))
+        self.assertEqual(predictor.wear_rate, [5.0] * 4)
+        self.assertEqual(predictor.predict()["tire_laps_left"], [12.0] * 4)
+
+    def test_new_race_resets_rates(self):
+        predictor = StrategyPredictor()
+        self.drive(predictor, 3, start_lap=2)
+        predictor.update(self.make_packet(0, [100] * 4, 1.0))
+        self.assertIsNone(predictor.wear_rate)
+        self.assertIsNone(predictor.fuel_rate)
+
+    def test_config_applies_to_new_predictors(self):
+        saved = {k: getattr(main, k.upper()) for k in ("strategy_tire_limit", "strategy_alpha")}
+        try:
+            main.apply_config({"strategy_tire_limit": 30, "strategy_alpha": 0.5})
+            predictor = StrategyPredictor()
+            self.assertEqual((predictor.tire_limit, predictor.alpha), (30.0, 0.5))
+            self.drive(predictor, 4)
+            self.assertEqual(predictor.predict()["tire_laps_left"], [10.0] * 4)
+        finally:
+            main.apply_config(saved)
+
+    def test_overlay_strategy_label(self):
+        predictor = StrategyPredictor()
+        self.drive(predictor, 4)
+        packet = SimpleNamespace(input_gear=3, speed=30.0, cur_rpm=4000.0, max_rpm=8000.0, race_pos=1,
+                                 lap_number=4, best_lap=0.0, tire_wear=(0.2, 0.2, 0.2, 0.2))
+        changes = OverlayRenderModel().diff(packet, predictor.predict())
+        self.assertEqual(changes["strategy"], "Fuel: 6.0 laps  Tires: 8.0 laps")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import main
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import StreamHealth, HEALTH_HIST_MS
+
+class TestStreamHealth(unittest.TestCase):
+    def feed(self, health, timestamps, spacing=1 / 60):
+        return [health.observe(ts, i * spacing) for i, ts in enumerate(timestamps)]
+
+    def test_steady_stream(self):
+        health = StreamHealth()
+        results = self.feed(health, [1000 + round(i * 1000 / 60) for i in range(120)])
+        self.assertTrue(all(status == "ok" for status, _ in results))
+        summary = health.summary()
+        self.assertEqual(summary["missing"], 0)
+        self.assertLess(summary["jitter_ms"], 1.0)
+        self.assertEqual(sum(summary["arrival_hist_ms"]), 119)
+
+    def test_gap_counts_missing_packets(self):
+        health = StreamHealth()
+        results = self.feed(health, [0, 17, 33, 100, 117])
+        self.assertEqual(results[3], ("gap", 3))
+        self.assertEqual(health.missing, 3)
+        self.assertEqual(health.gaps, 1)
+
+    def test_duplicates_and_reordering(self):
+        health = StreamHealth()
+        results = self.feed(health, [0, 17, 17, 50, 33, 67])
+        self.assertEqual([s for s, _ in results], ["ok", "ok", "duplicate", "gap", "filled", "ok"])
+        self.assertEqual((health.duplicates, health.reordered), (1, 1))
+
+    def test_late_packet_fills_gap(self):
+        health = StreamHealth()
+        results = self.feed(health, [0, 17, 50, 33, 67, 10])
+        self.assertEqual([s for s, _ in results], ["ok", "ok", "gap", "filled", "ok", "late"])
+        summary = health.summary()
+        self.assertEqual(summary["missing"], 0)
+        self.assertEqual(summary["filled"], 1)
+        self.assertEqual(summary["loss_pct"], 0.0)
+
+    def test_backward_jump_resets_stream(self):
+        health = StreamHealth()
+        self.feed(health, [5000000 + i * 17 for i in range(100)])
+        results = [health.observe(100 + i * 17, 10 + i / 60) for i in range(5)]
+        self.assertEqual([s for s, _ in results], ["reset", "ok", "ok", "ok", "ok"])
+        self.assertEqual(health.resets, 1)
+        self.assertEqual(health.reordered, 0)
+
+    def test_forward_jump_is_break_not_loss(self):
+        health = StreamHealth()
+        self.feed(health, [i * 17 for i in range(60)])
+        results = [health.observe(60000 + i * 17, 61 + i / 60) for i in range(5)]
+        self.assertEqual([s for s, _ in results], ["reset", "ok", "ok", "ok", "ok"])
+        summary = health.summary()
+        self.assertEqual((summary["missing"], summary["gaps"], summary["resets"]), (0, 0, 1))
+        self.assertEqual(summary["loss_pct"], 0.0)
+
+    def test_jitter_ignores_out_of_order_arrivals(self):
+        health = StreamHealth()
+        # A duplicate arriving between two evenly spaced packets must not skew jitter
+        health.observe(0, 0.0)
+        health.observe(0, 0.008)
+        health.observe(17, 0.017)
+        self.assertEqual(health.jitter_ms, 0.0)
+
+    def test_timestamp_wraparound(self):
+        health = StreamHealth()
+        results = self.feed(health, [0xFFFFFFF0, 0x00000001])
+        self.assertEqual(results[1], ("ok", 0))
+
+    def test_histogram_is_bounded(self):
+        health = StreamHealth()
+        health.observe(0, 0.0)
+        health.observe(17, 5.0)
+        self.assertEqual(len(health.arrival_hist), HEALTH_HIST_MS + 1)
+        self.assertEqual(health.arrival_hist[-1], 1)
+
+if __name__ == '__main__':
+    unittest.main()